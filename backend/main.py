@@ -1,36 +1,61 @@
 # backend/main.py
 
 import os
-import requests
+import asyncio
+import functools
+import importlib.util
+import httpx
+from contextlib import asynccontextmanager
+import fastapi
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional, Dict, Any, AsyncIterator, Tuple
 import logging
-import traceback
 
 # --- Load environment variables ---
 load_dotenv()
+# Read once at import; checked on every request that fetches Census data
+CENSUS_API_KEY = os.getenv("CENSUS_API_KEY")
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logging.info(f"DEBUG: RENTCAST_API_KEY loaded: {'Yes' if os.getenv('RENTCAST_API_KEY') else 'NO'}")
-logging.info(f"DEBUG: CENSUS_API_KEY loaded: {'Yes' if os.getenv('CENSUS_API_KEY') else 'NO'}")
+logging.info(f"DEBUG: CENSUS_API_KEY loaded: {'Yes' if CENSUS_API_KEY else 'NO'}")
 logging.info(f"DEBUG: GEMINI_API_KEY loaded: {'Yes' if os.getenv('GEMINI_API_KEY') else 'NO'}")
 
 
 # --- Import Services ---
+from services.http_client import close_http_client
 from services.rentcast_service import get_property_info
 from services.census_service import fetch_demographic_data
 # --- Import the ML numerical prediction service ---
 from services.ml_service import generate_numerical_predictions
 # --- Import the NEW Gemini service ---
-from services.gemini_service import get_ai_summary
+from services.gemini_service import stream_ai_summary
 # --- Add imports for actual History service when ready ---
 
+# FastAPI >= 0.130 serializes response models straight to JSON bytes via Pydantic (and 0.135+ deprecates
+# ORJSONResponse); a custom response class would bypass that fast path, so only use orjson on older versions.
+# orjson is optional there too: ORJSONResponse only fails at render time if it's missing, so check up front.
+FASTAPI_SERIALIZES_DIRECTLY = tuple(int(part) for part in fastapi.__version__.split(".")[:2]) >= (0, 130)
+USE_ORJSON = not FASTAPI_SERIALIZES_DIRECTLY and importlib.util.find_spec("orjson") is not None
+_response_class_kwargs = {"default_response_class": ORJSONResponse} if USE_ORJSON else {}
+
+# --- Shared HTTP client lifecycle ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield # Nothing to set up: the shared client is created lazily on first use
+    await close_http_client()
+
 app = FastAPI(
     title="ShelterSignal API",
-    description="Provides property insights using Rentcast, Census, ML predictions and AI-generated summaries.",
-    version="0.3.0" # Incremented version
+    description="Provides property insights using Rentcast, Census, ML predictions and streamed AI-generated summaries.",
+    version="0.4.0", # Incremented version: AI summary moved to its own streaming endpoint
+    lifespan=lifespan,
+    **_response_class_kwargs # Older FastAPI: orjson encodes the nested prediction/history payloads much faster than stdlib json
 )
 
 # --- CORS Middleware ---
@@ -46,26 +71,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Compression Middleware ---
+# The /property JSON (repeated keys, point arrays) compresses well; tiny bodies aren't worth it.
+# text/event-stream (/property/summary) is in Starlette's default exclusions, so SSE isn't buffered.
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 
 # --- Pydantic Models ---
 class HistoricalValue(BaseModel):
+    model_config = ConfigDict(extra='ignore', populate_by_name=True)
     date: str
     value: float
 
 # --- NEW: Prediction Point Model ---
 class PredictionPoint(BaseModel):
+    model_config = ConfigDict(extra='ignore', populate_by_name=True)
     date: str # Date for the prediction point (e.g., "YYYY-MM-DD")
     value: float # Predicted value
 
 class CensusData(BaseModel):
+    model_config = ConfigDict(extra='ignore', populate_by_name=True)
     totalPopulation: Optional[int] = Field(None, alias='DP05_0001E')
     malePopulation: Optional[int] = Field(None, alias='DP05_0002E')
     femalePopulation: Optional[int] = Field(None, alias='DP05_0003E')
     medianAge: Optional[float] = Field(None, alias='DP05_0018E')
-    class Config:
-        populate_by_name = True
+
+# Placeholder history: (date, multiplier on the current value estimate)
+_HIST_OFFSETS = (("2022-01-01", 0.9), ("2022-07-01", 0.95), ("2023-01-01", 1.0), ("2023-07-01", 1.02))
+DEFAULT_HISTORY_BASE_VALUE = 550000
+
+# Census variables (aliases on CensusData) picked out of the raw API row
+CENSUS_FIELDS = ('DP05_0001E', 'DP05_0002E', 'DP05_0003E', 'DP05_0018E')
 
 class PropertyDataResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore', populate_by_name=True)
     # Rentcast Fields...
     id: Optional[str] = None
     address: Optional[str] = None
@@ -101,9 +140,62 @@ class PropertyDataResponse(BaseModel):
 
     # Census Data
     censusData: Optional[CensusData] = None
+    # AI summary is streamed separately from /property/summary
+
 
-    # AI Summary Field
-    aiSummary: Optional[str] = None
+# --- Census Helper ---
+async def _fetch_census_data(zip_code: str) -> Optional[CensusData]:
+    """Fetches and parses Census demographics for a zip code, returning None on any failure."""
+    try:
+        census_api_data = await fetch_demographic_data(zipcode=zip_code)
+    except Exception as census_err:
+        logging.error(f"Failed to fetch Census data: {census_err}")
+        return None
+
+    if not (census_api_data and isinstance(census_api_data, list) and len(census_api_data) > 1):
+        return None
+
+    try:
+        header = census_api_data[0]
+        values = census_api_data[1]
+        raw_census_dict = dict(zip(header, values))
+        parsed_census_data = CensusData.model_validate({k: raw_census_dict.get(k) for k in CENSUS_FIELDS})
+        logging.info(f"Parsed Census data")
+        return parsed_census_data
+    except Exception as parse_err:
+        logging.error(f"Error parsing Census data: {parse_err}")
+        return None
+
+
+# --- Response Cache ---
+# Keyed by normalized address. Stores the build Task rather than the finished response so
+# concurrent identical requests share one upstream fan-out (Rentcast, Census, ML).
+RESPONSE_CACHE_TTL_SECONDS = 600
+_RESP_CACHE = TTLCache(maxsize=1024, ttl=RESPONSE_CACHE_TTL_SECONDS)
+
+def _evict_failed_response(key: str, task: asyncio.Task):
+    """
+    Drops failed, cancelled or degraded builds (Census/ML fell back) from the cache so errors
+    aren't served for the whole TTL. Callers already awaiting the task still get its result.
+    """
+    if task.cancelled() or task.exception() is not None or not task.result()[1]:
+        if _RESP_CACHE.get(key) is task:
+            _RESP_CACHE.pop(key, None)
+
+async def _get_property_response(address: str) -> PropertyDataResponse:
+    """Returns the cached response for an address, starting (or joining) a build on a miss."""
+    key = address.strip().lower()
+    task = _RESP_CACHE.get(key)
+    if task is None:
+        task = asyncio.create_task(_build_property_response(address))
+        _RESP_CACHE[key] = task
+        task.add_done_callback(functools.partial(_evict_failed_response, key))
+    else:
+        logging.info(f"Serving cached/in-flight response for address: {address}")
+    # Shield so one client disconnecting doesn't cancel the build other callers are awaiting
+    response_data, _ = await asyncio.shield(task)
+    # The cached object is shared across callers, so echo each caller's own address on a copy
+    return response_data.model_copy(update={"address": address})
 
 
 # --- API Endpoint ---
@@ -111,21 +203,27 @@ class PropertyDataResponse(BaseModel):
     "/property",
     response_model=PropertyDataResponse,
     summary="Get Property Details and Predictions",
-    description="Fetches property information from Rentcast, Census, adds ML predictions and AI-generated summaries."
+    description="Fetches property information from Rentcast, Census and adds ML predictions. The AI summary is streamed from /property/summary."
 )
 async def get_property_details(
     address: str = Query(..., description="Full street address (e.g., '123 Main St, Anytown, CA')")
 ):
     logging.info(f"Backend received request for address: {address}")
+    return await _get_property_response(address)
+
+
+async def _build_property_response(address: str) -> Tuple[PropertyDataResponse, bool]:
+    """
+    Fetches and combines all upstream data for an address into a PropertyDataResponse.
+    Also returns whether the response is complete enough to cache (no Census or ML fallback).
+    """
     rentcast_data = None
-    census_api_data = None
     parsed_census_data = None
     ml_predictions = None # Holds numerical predictions + points
-    ai_summary = None # Holds the text summary
 
     try:
         # --- 1. Fetch base data from Rentcast ---
-        rentcast_data_list = get_property_info(address=address)
+        rentcast_data_list = await get_property_info(address=address)
         if not rentcast_data_list:
              raise HTTPException(status_code=404, detail="Property data not found for the specified address.")
         rentcast_data = rentcast_data_list[0]
@@ -134,75 +232,54 @@ async def get_property_details(
         logging.info(f"Rentcast data received for {address}")
 
 
-        # --- 2. Fetch and Parse Census Data ---
+        # --- 2 & 3. Fetch Census Data and Generate ML Predictions concurrently ---
+        # Both only depend on the Rentcast result, so overlap them instead of awaiting in turn
         zip_code = rentcast_data.get('zipCode')
-        if zip_code and os.getenv("CENSUS_API_KEY"):
-            try:
-                census_api_data = await fetch_demographic_data(zipcode=zip_code)
-                if census_api_data and isinstance(census_api_data, list) and len(census_api_data) > 1:
-                    try:
-                        header = census_api_data[0]
-                        values = census_api_data[1]
-                        raw_census_dict = {header[i]: values[i] for i in range(len(header))}
-                        parsed_census_data = CensusData(
-                            DP05_0001E=raw_census_dict.get('DP05_0001E'),
-                            DP05_0002E=raw_census_dict.get('DP05_0002E'),
-                            DP05_0003E=raw_census_dict.get('DP05_0003E'),
-                            DP05_0018E=raw_census_dict.get('DP05_0018E')
-                        )
-                        logging.info(f"Parsed Census data")
-                    except Exception as parse_err:
-                        logging.error(f"Error parsing Census data: {parse_err}")
-                        parsed_census_data = None
-            except Exception as census_err:
-                logging.error(f"Failed to fetch Census data: {census_err}")
-                parsed_census_data = None
-        else:
-             logging.warning(f"Skipping Census fetch/parse (Zip: {zip_code}, Key Set: {bool(os.getenv('CENSUS_API_KEY'))})")
-
-
-        # --- 3. Generate Numerical ML Predictions ---
-        try:
-            ml_predictions = generate_numerical_predictions(rentcast_data)
-            logging.info(f"Numerical ML predictions generated successfully")
-        except Exception as ml_err:
-            logging.error(f"Error during numerical ML prediction: {ml_err}\n{traceback.format_exc()}")
+        # Only create the Census coroutine when it can run, so skipped requests schedule nothing for it
+        census_coro = _fetch_census_data(zip_code) if (zip_code and CENSUS_API_KEY) else None
+        if census_coro is None:
+            logging.warning(f"Skipping Census fetch/parse (Zip: {zip_code}, Key Set: {bool(CENSUS_API_KEY)})")
+        ml_coro = asyncio.to_thread(generate_numerical_predictions, rentcast_data)
+        results = await asyncio.gather(*[c for c in (census_coro, ml_coro) if c is not None], return_exceptions=True)
+        parsed_census_data, ml_predictions = results if census_coro is not None else (None, results[0])
+
+        if isinstance(parsed_census_data, Exception):
+            logging.error(f"Failed to fetch Census data: {parsed_census_data}")
+            parsed_census_data = None
+        # Census was attempted but came back empty (fetch/parse errors are swallowed into None)
+        cacheable = census_coro is None or parsed_census_data is not None
+
+        if isinstance(ml_predictions, Exception):
+            # exc_info defers traceback formatting to the handler instead of building the string up front
+            logging.error("ML prediction failed: %s", ml_predictions, exc_info=ml_predictions)
             # Provide fallback structure even if ML fails
+            cacheable = False
             ml_predictions = {
                 "predictedValueNextYear": None, "predictionConfidence": 0.0,
                 "marketTrend": "Error", "trendConfidence": 0.0,
                 "predictedRentNextYear": None, "predictionPoints": []
             }
+        else:
+            logging.info(f"Numerical ML predictions generated successfully")
 
 
-        # --- 4. Generate AI Summary using Gemini ---
-        try:
-            # Pass raw rentcast data, parsed census data (as dict), and numerical predictions
-            census_dict_for_ai = parsed_census_data.model_dump(exclude_none=True, by_alias=False) if parsed_census_data else None
-            ai_summary = await get_ai_summary(rentcast_data, census_dict_for_ai, ml_predictions)
-            logging.info(f"AI summary processing completed.")
-        except Exception as ai_err:
-            logging.error(f"Error during AI summary generation: {ai_err}\n{traceback.format_exc()}")
-            ai_summary = "AI summary could not be generated due to an unexpected error."
-
-
-        # --- 5. Generate Historical Data (Placeholder) ---
+        # --- 4. Generate Historical Data (Placeholder) ---
         current_value = rentcast_data.get("valueEstimate")
-        base_value_for_history = current_value if current_value else 550000
+        base_value_for_history = current_value if current_value else DEFAULT_HISTORY_BASE_VALUE
         historical_data = [
-            {"date": "2022-01-01", "value": base_value_for_history * 0.9},
-            {"date": "2022-07-01", "value": base_value_for_history * 0.95},
-            {"date": "2023-01-01", "value": base_value_for_history * 1.0},
-            {"date": "2023-07-01", "value": base_value_for_history * 1.02},
+            HistoricalValue.model_construct(date=date, value=base_value_for_history * factor)
+            for date, factor in _HIST_OFFSETS
         ]
         logging.info(f"Generated historical data")
 
 
-        # --- 6. Combine data into the response structure ---
+        # --- 5. Combine data into the response structure ---
+        # Validates the untrusted Rentcast scalars; the nested model instances built above with
+        # model_construct are passed through as-is (pydantic doesn't revalidate instances)
         response_data = PropertyDataResponse(
             # Rentcast fields...
             id=rentcast_data.get('id'),
-            address=address,
+            # address is filled in per caller by _get_property_response
             formattedAddress=rentcast_data.get('formattedAddress'),
             latitude=rentcast_data.get('latitude'),
             longitude=rentcast_data.get('longitude'),
@@ -229,10 +306,7 @@ async def get_property_details(
             marketTrend=ml_predictions.get('marketTrend'),
             trendConfidence=ml_predictions.get('trendConfidence'),
             predictedRentNextYear=ml_predictions.get('predictedRentNextYear'),
-            predictionPoints=ml_predictions.get('predictionPoints'), # Add prediction points
-
-            # AI Summary
-            aiSummary=ai_summary,
+            predictionPoints=[PredictionPoint.model_construct(**point) for point in ml_predictions.get('predictionPoints') or []], # Add prediction points
 
             # Historical and Census data
             historicalValues=historical_data,
@@ -240,23 +314,68 @@ async def get_property_details(
         )
 
         logging.info(f"Backend successfully processed request for: {address}")
-        return response_data
+        return response_data, cacheable
 
     # --- Error Handling ---
-    except requests.exceptions.HTTPError as http_err:
+    except httpx.HTTPStatusError as http_err:
         # ... (keep existing handling) ...
-        status_code = http_err.response.status_code if http_err.response else 500
+        status_code = http_err.response.status_code if http_err.response is not None else 500
         if status_code == 401: raise HTTPException(status_code=503, detail="Service unavailable: Auth Error.")
         elif status_code == 404: raise HTTPException(status_code=404, detail="Property data not found.")
         else: raise HTTPException(status_code=502, detail="Bad Gateway: Error with data provider.")
     except HTTPException as fastapi_http_exc:
          raise fastapi_http_exc # Re-raise FastAPI's controlled exceptions
-    except Exception as e:
-        logging.error(f"Backend UNEXPECTED Error processing request for {address}:\n{traceback.format_exc()}")
+    except Exception:
+        logging.exception("Backend UNEXPECTED Error processing request for %s", address)
         raise HTTPException(status_code=500, detail="An internal server error occurred.")
 
 
+# --- AI Summary Streaming Endpoint ---
+async def _to_sse_events(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Wraps text chunks as Server-Sent Events, ending with a 'done' event so clients stop reconnecting."""
+    async for text in chunks:
+        # Multi-line chunks need one 'data:' field per line; the client re-joins them with newlines
+        yield "".join(f"data: {line}\n" for line in text.split("\n")) + "\n"
+    yield "event: done\ndata: \n\n"
+
+
+@app.post(
+    "/property/summary",
+    response_class=StreamingResponse,
+    summary="Stream AI Property Summary",
+    description="Streams the Gemini-generated investment summary for a /property result as Server-Sent Events."
+)
+async def stream_property_summary(property_data: PropertyDataResponse):
+    logging.info(f"Backend received summary request for: {property_data.formattedAddress or property_data.address}")
+    # The client posts back the /property payload it already has, so no upstream data is re-fetched here
+    details = property_data.model_dump()
+    return StreamingResponse(
+        _to_sse_events(stream_ai_summary(details, details.get('censusData'), details)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # --- Root endpoint ---
 @app.get("/", summary="Health Check")
 def read_root():
-    return {"message": "ShelterSignal Backend is running"}
\ No newline at end of file
+    return {"message": "ShelterSignal Backend is running"}
+
+# --- Local server entry point (python main.py) ---
+if __name__ == "__main__":
+    import sys
+    import uvicorn
+
+    # uvloop/httptools are optional speedups (uvloop has no Windows build); fall back to asyncio/h11 without them
+    use_uvloop = sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None
+    use_httptools = importlib.util.find_spec("httptools") is not None
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8001")), # Frontend API routes default to localhost:8001
+        loop="uvloop" if use_uvloop else "asyncio",
+        http="httptools" if use_httptools else "h11",
+        # Each worker keeps its own response cache; /property/summary streams from the posted payload,
+        # so a request landing on another worker costs no extra upstream calls
+        workers=int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1))),
+    )
@@ -1,5 +1,5 @@
 import os
-import httpx
+from services.http_client import get_http_client
 
 CENSUS_API_KEY = os.getenv("CENSUS_API_KEY")
 
@@ -11,9 +11,9 @@ async def fetch_demographic_data(zipcode: str):
         "key": CENSUS_API_KEY
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
-        census_data = response.json()
+    client = get_http_client()
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    census_data = response.json()
 
     return census_data
@@ -1,5 +1,5 @@
 import os
-import httpx
+from services.http_client import get_http_client
 
 FRED_API_KEY = os.getenv("FRED_API_KEY")
 
@@ -11,9 +11,9 @@ async def fetch_market_trends():
         "file_type": "json"
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
-        fred_data = response.json()
+    client = get_http_client()
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    fred_data = response.json()
 
     return fred_data
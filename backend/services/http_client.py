@@ -0,0 +1,33 @@
+# backend/services/http_client.py
+
+import importlib.util
+import httpx
+from typing import Optional
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2]); fall back to HTTP/1.1 without it
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the process-wide keep-alive client shared by all outbound API calls.
+    Created lazily on first use so sockets (and TLS sessions) are reused across requests.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=300),
+            timeout=httpx.Timeout(30.0),
+            http2=HTTP2_ENABLED,
+        )
+    return _client
+
+
+async def close_http_client():
+    """Closes the shared client, releasing pooled connections. Registered on app shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,10 +1,12 @@
 # backend/services/ml_service.py
 
 import logging
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 # --- Constants for Heuristic Model ---
 DEFAULT_BASE_VALUE = 550000
@@ -12,32 +14,24 @@ AVG_SQFT_VALUE_NYC = 650
 BEDROOM_VALUE_ADJ = 35000
 BATHROOM_VALUE_ADJ = 20000
 YEAR_BUILT_DEPRECIATION_RATE = 0.001
-PROPERTY_TYPE_FACTORS = {
+PROPERTY_TYPE_FACTORS = MappingProxyType({
     "Single Family": 1.05, "Condo": 1.0, "Townhouse": 1.02,
     "Multi Family": 0.95, "Apartment": 1.0, "Default": 1.0
-}
-LOCATION_FACTORS = {
+})
+LOCATION_FACTORS = MappingProxyType({
     "10005": 1.3, "10013": 1.4, "10019": 1.25, "10128": 1.2, # Manhattan
     "11201": 1.2, "11211": 1.15, "11215": 1.1, "11243": 1.1, # Brooklyn
     "11102": 1.0, "11375": 1.05, "11104": 0.98, # Queens
     "10463": 0.95, "10471": 1.0, # Bronx
     "10301": 0.9, "10309": 0.85, # Staten Island
     "Default": 1.0
-}
+})
 ANNUAL_APPRECIATION_RATE = 0.04 # General market trend
 PREDICTION_YEARS = 3 # How many years into the future to predict for the chart
+PREDICTION_CACHE_SIZE = 4096 # Distinct feature combinations kept by _predict_cached
 
-def _calculate_heuristic_value(property_data: Dict[str, Any]) -> tuple[float, float]:
+def _calculate_heuristic_value(current_estimate, sqft, bedrooms, bathrooms, year_built, zip_code, property_type, current_year: int) -> tuple[float, float]:
     """Calculates a heuristic base value and confidence based on features."""
-    # --- This internal function remains the same as the previous version ---
-    current_estimate = property_data.get('valueEstimate')
-    sqft = property_data.get('squareFootage')
-    bedrooms = property_data.get('bedrooms')
-    bathrooms = property_data.get('bathrooms')
-    year_built = property_data.get('yearBuilt')
-    zip_code = property_data.get('zipCode')
-    property_type = property_data.get('propertyType', "Default")
-
     base_value = current_estimate if current_estimate else DEFAULT_BASE_VALUE
     confidence = 0.75 if current_estimate else 0.50
 
@@ -58,8 +52,8 @@ def _calculate_heuristic_value(property_data: Dict[str, Any]) -> tuple[float, fl
         base_value += (bathrooms - 2) * BATHROOM_VALUE_ADJ
         confidence = min(0.9, confidence + 0.01)
 
-    if year_built and 1800 < year_built <= datetime.now().year:
-        age = datetime.now().year - year_built
+    if year_built and 1800 < year_built <= current_year:
+        age = current_year - year_built
         age_factor = max(0.85, 1 - (age * YEAR_BUILT_DEPRECIATION_RATE))
         base_value *= age_factor
         confidence = min(0.9, confidence + 0.02)
@@ -78,15 +72,17 @@ def _calculate_heuristic_value(property_data: Dict[str, Any]) -> tuple[float, fl
     return base_value, confidence
 
 
-def generate_numerical_predictions(property_data: Dict[str, Any]) -> Dict[str, Any]:
+@lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+def _predict_cached(current_estimate, sqft, bedrooms, bathrooms, year_built, zip_code, property_type, current_year) -> Tuple:
     """
-    Generates numerical predictions including future points for charting.
+    Runs the heuristic model for one feature combination.
+    Pure function of its arguments, so results are memoized; returns only immutable
+    values (prediction points as (date, value) tuples) so cached entries can't be mutated by callers.
     """
-    logging.info(f"Generating numerical predictions for property ID: {property_data.get('id', 'N/A')}")
-
     # 1. Calculate Heuristic Base Value and Confidence
-    base_value, confidence = _calculate_heuristic_value(property_data)
-    current_year = datetime.now().year
+    base_value, confidence = _calculate_heuristic_value(
+        current_estimate, sqft, bedrooms, bathrooms, year_built, zip_code, property_type, current_year
+    )
 
     # 2. Generate Prediction Points for Chart
     prediction_points = []
@@ -95,34 +91,55 @@ def generate_numerical_predictions(property_data: Dict[str, Any]) -> Dict[str, A
     # Add current estimated value as the starting point (Year 0)
     # Use ISO format date for consistency with historical chart
     start_date = f"{current_year}-01-01" # Approximate start date
-    prediction_points.append({"date": start_date, "value": round(current_pred_value, 0)})
+    prediction_points.append((start_date, round(current_pred_value, 0)))
 
     for i in range(1, PREDICTION_YEARS + 1):
         # Apply appreciation rate cumulatively
         current_pred_value *= (1 + ANNUAL_APPRECIATION_RATE)
         future_date = f"{current_year + i}-01-01"
-        prediction_points.append({"date": future_date, "value": round(current_pred_value, 0)})
+        prediction_points.append((future_date, round(current_pred_value, 0)))
 
     # 3. Determine Market Trend
     market_trend = "Increasing" # Default
     trend_confidence = 0.70
-    location_factor = LOCATION_FACTORS.get(property_data.get('zipCode'), LOCATION_FACTORS["Default"]) if property_data.get('zipCode') else LOCATION_FACTORS["Default"]
+    location_factor = LOCATION_FACTORS.get(zip_code, LOCATION_FACTORS["Default"]) if zip_code else LOCATION_FACTORS["Default"]
     if location_factor < 0.95:
         market_trend = "Stable"
         trend_confidence = 0.60
     elif location_factor > 1.2:
         trend_confidence = 0.80
 
-    # 4. Prepare final prediction dictionary
+    return confidence, tuple(prediction_points), market_trend, round(trend_confidence, 2)
+
+
+def generate_numerical_predictions(property_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generates numerical predictions including future points for charting.
+    """
+    logger.info(f"Generating numerical predictions for property ID: {property_data.get('id', 'N/A')}")
+    current_year = datetime.now().year
+
+    confidence, prediction_points, market_trend, trend_confidence = _predict_cached(
+        property_data.get('valueEstimate'),
+        property_data.get('squareFootage'),
+        property_data.get('bedrooms'),
+        property_data.get('bathrooms'),
+        property_data.get('yearBuilt'),
+        property_data.get('zipCode'),
+        property_data.get('propertyType', "Default"),
+        current_year,
+    )
+
+    # 4. Prepare final prediction dictionary (fresh objects per call, the cached tuples stay untouched)
     predictions = {
         # Use the +1 year value for the main prediction display
-        "predictedValueNextYear": prediction_points[1]['value'] if len(prediction_points) > 1 else None,
+        "predictedValueNextYear": prediction_points[1][1] if len(prediction_points) > 1 else None,
         "predictionConfidence": confidence,
         "marketTrend": market_trend,
-        "trendConfidence": round(trend_confidence, 2),
+        "trendConfidence": trend_confidence,
         "predictedRentNextYear": None, # Rent prediction still needs separate logic
-        "predictionPoints": prediction_points # Include the points for the chart
+        "predictionPoints": [{"date": date, "value": value} for date, value in prediction_points] # Include the points for the chart
     }
 
-    logging.info(f"Numerical prediction results: {predictions}")
-    return predictions
\ No newline at end of file
+    logger.info(f"Numerical prediction results: {predictions}")
+    return predictions
@@ -1,5 +1,5 @@
 import os
-import httpx
+from services.http_client import get_http_client
 
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
 
@@ -11,9 +11,9 @@ async def fetch_market_news():
         "apiKey": NEWSAPI_KEY
     }
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, params=params)
-        response.raise_for_status()
-        news_data = response.json()
+    client = get_http_client()
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    news_data = response.json()
 
     return news_data
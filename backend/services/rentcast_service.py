@@ -1,24 +1,23 @@
 # backend/services/rentcast_service.py
 
 import os
-import requests
+import httpx
 import logging # Use logging instead of print for better practice
+from services.http_client import get_http_client
 
-# Configure basic logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 RENTCAST_API_KEY = os.getenv("RENTCAST_API_KEY")
 RENTCAST_BASE_URL = "https://api.rentcast.io/v1"
 
 # Add a check and log if the API key is missing right at the start
 if not RENTCAST_API_KEY:
-    logging.error("CRITICAL: RENTCAST_API_KEY environment variable not found!")
+    logger.error("CRITICAL: RENTCAST_API_KEY environment variable not found!")
 else:
     # Log partial key for confirmation without exposing the whole thing
-    logging.info(f"Rentcast Service: Using API Key ending in ...{RENTCAST_API_KEY[-4:]}")
+    logger.info(f"Rentcast Service: Using API Key ending in ...{RENTCAST_API_KEY[-4:]}")
 
-
-def get_property_info(address=None, city=None, state=None, zip_code=None):
+async def get_property_info(address=None, city=None, state=None, zip_code=None):
     url = f"{RENTCAST_BASE_URL}/properties"
     headers = {
         "X-Api-Key": RENTCAST_API_KEY,
@@ -26,7 +25,7 @@ def get_property_info(address=None, city=None, state=None, zip_code=None):
     }
     # Ensure API key is actually present before making the call
     if not RENTCAST_API_KEY:
-         logging.error("Rentcast call aborted: API Key is missing.")
+         logger.error("Rentcast call aborted: API Key is missing.")
          # Raise an internal exception or return None/empty list,
          # which main.py should handle appropriately.
          # Raising HTTPError here might be misleading.
@@ -42,27 +41,28 @@ def get_property_info(address=None, city=None, state=None, zip_code=None):
     if zip_code:
         params["zipCode"] = zip_code
 
-    logging.info(f"Calling Rentcast API: URL={url}, Params={params}") # Log request details
+    logger.info(f"Calling Rentcast API: URL={url}, Params={params}") # Log request details
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=10) # Add a timeout
+        response = await get_http_client().get(url, headers=headers, params=params, timeout=10.0)
 
         # --- DETAILED LOGGING BEFORE raise_for_status ---
-        logging.info(f"Rentcast Response Status Code: {response.status_code}")
+        logger.info(f"Rentcast Response Status Code: {response.status_code}")
         # Log first 500 chars of response text for debugging, regardless of status code
-        logging.info(f"Rentcast Response Text (first 500 chars): {response.text[:500]}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Rentcast Response Text (first 500 chars): {response.text[:500]}")
         # --- END OF DETAILED LOGGING ---
 
         # Now, check the status code explicitly before raising
         response.raise_for_status() # Raise HTTPError for 4xx/5xx status codes
 
         # If raise_for_status didn't trigger, we have a successful response (2xx)
-        logging.info(f"Rentcast call successful for address: {address}")
+        logger.info(f"Rentcast call successful for address: {address}")
         return response.json()
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         # Catch potential connection errors, timeouts, etc.
-        logging.error(f"Rentcast API request failed: {e}")
+        logger.error(f"Rentcast API request failed: {e}")
         # Re-raise or handle as appropriate for main.py
         # Raising the original exception might be best here
         raise e
\ No newline at end of file
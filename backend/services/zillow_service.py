@@ -1,10 +1,10 @@
 # backend/services/zillow_service.py
 import os
-import requests
+from services.http_client import get_http_client
 
 ZILLOW_API_KEY = os.getenv("ZILLOW_API_KEY")
 
-def get_property_info(address: str):
+async def get_property_info(address: str):
     """Get basic property info from Zillow API."""
     url = "https://zillow-com1.p.rapidapi.com/resolveAddressToZpid"
     headers = {
@@ -14,7 +14,7 @@ def get_property_info(address: str):
     }
     payload = {"address": address}
 
-    response = requests.post(url, data=payload, headers=headers)
+    response = await get_http_client().post(url, data=payload, headers=headers, timeout=10.0)
     response.raise_for_status()
 
     data = response.json()
@@ -0,0 +1,69 @@
+// frontend/pages/api/summary.ts
+import type { NextApiRequest, NextApiResponse } from 'next';
+
+// Streaming AI summary lives next to the property endpoint on the Python backend
+const BACKEND_API_URL = process.env.BACKEND_API_URL || 'http://localhost:8001/property';
+const BACKEND_SUMMARY_URL = `${BACKEND_API_URL}/summary`;
+
+// Let the SSE stream through without Next buffering or size-limiting the body
+export const config = {
+  api: { responseLimit: false },
+};
+
+export default async function handler(req: NextApiRequest, res: NextApiResponse) {
+  // Only allow POST requests (the body is the /api/property result the page already has)
+  if (req.method !== 'POST') {
+    res.setHeader('Allow', ['POST']);
+    return res.status(405).json({ message: `Method ${req.method} Not Allowed` });
+  }
+
+  const propertyData = req.body;
+
+  // Validate input
+  if (!propertyData || typeof propertyData !== 'object') {
+    return res.status(400).json({ message: 'Property data is required in the request body.' });
+  }
+  const address = propertyData.formattedAddress || propertyData.address;
+
+  // Stop reading from the backend if the browser goes away
+  const controller = new AbortController();
+  req.on('close', () => controller.abort());
+
+  try {
+    // Forward the property data so the backend doesn't re-fetch it from Rentcast/Census
+    const backendResponse = await fetch(BACKEND_SUMMARY_URL, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify(propertyData),
+      signal: controller.signal,
+    });
+
+    if (!backendResponse.ok || !backendResponse.body) {
+      console.warn(`[API Route] Summary stream returned status ${backendResponse.status} for: ${address}`);
+      return res.status(backendResponse.status || 502).json({ message: 'AI summary is unavailable for this property.' });
+    }
+
+    res.writeHead(200, {
+      'Content-Type': 'text/event-stream',
+      'Cache-Control': 'no-cache',
+      Connection: 'keep-alive',
+    });
+
+    // Forward each SSE chunk as soon as it arrives
+    const reader = backendResponse.body.getReader();
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      res.write(value);
+    }
+    res.end();
+
+  } catch (error) {
+    if (controller.signal.aborted) return; // Client disconnected, nothing left to send
+    console.error("[API Route] Error streaming summary from backend:", error);
+    if (!res.headersSent) {
+      return res.status(500).json({ message: 'An unexpected error occurred while streaming the AI summary.' });
+    }
+    res.end();
+  }
+}
@@ -1,7 +1,7 @@
 // frontend/src/app/page.tsx
 "use client";
 
-import { useState } from "react";
+import { useState, useRef, useEffect } from "react";
 import axios, { AxiosError } from 'axios';
 import SearchBar from "@/components/searchbar";
 import InsightsDashboard from "@/components/insightsdashboard";
@@ -14,6 +14,58 @@ const HomePage = () => {
   const [isLoading, setIsLoading] = useState<boolean>(false);
   const [error, setError] = useState<string | null>(null);
   const [isNotFoundError, setIsNotFoundError] = useState<boolean>(false); // State for specific 404
+  const [isSummaryStreaming, setIsSummaryStreaming] = useState<boolean>(false);
+  const summaryAbortRef = useRef<AbortController | null>(null); // Open AI summary stream, if any
+
+  // Abort any open summary stream when the page unmounts
+  useEffect(() => () => summaryAbortRef.current?.abort(), []);
+
+  // Streams the AI summary (Server-Sent Events) into propertyData.aiSummary as chunks arrive.
+  // POSTs the property data we already have so the backend doesn't fetch it again.
+  const streamAiSummary = async (data: PropertyData) => {
+    summaryAbortRef.current?.abort();
+    const controller = new AbortController();
+    summaryAbortRef.current = controller;
+    setIsSummaryStreaming(true);
+
+    const appendSummary = (text: string) =>
+      setPropertyData((prev) => prev ? { ...prev, aiSummary: (prev.aiSummary ?? "") + text } : prev);
+
+    try {
+      const response = await fetch("/api/summary", {
+        method: "POST",
+        headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
+        body: JSON.stringify(data),
+        signal: controller.signal,
+      });
+      if (!response.ok || !response.body) throw new Error(`Summary stream returned status ${response.status}`);
+
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = "";
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += value;
+        // Events are separated by a blank line; keep any trailing partial event for the next read
+        const events = buffer.split("\n\n");
+        buffer = events.pop() ?? "";
+        for (const event of events) {
+          const lines = event.split("\n");
+          // The backend sends a final 'done' event once the summary is complete
+          if (lines.includes("event: done")) return;
+          // Multi-line chunks arrive as one 'data:' line per text line; re-join them with newlines
+          appendSummary(lines.filter((line) => line.startsWith("data:")).map((line) => line.replace(/^data: ?/, "")).join("\n"));
+        }
+      }
+    } catch (err: unknown) {
+      if (!controller.signal.aborted) console.error("Error streaming AI summary:", err);
+    } finally {
+      if (summaryAbortRef.current === controller) {
+        summaryAbortRef.current = null;
+        setIsSummaryStreaming(false);
+      }
+    }
+  };
 
   const handleSearchSubmit = async (address: string) => {
     console.log("Search submitted for:", address);
@@ -21,6 +73,8 @@ const HomePage = () => {
     setError(null);
     setIsNotFoundError(false); // Reset not found state
     setPropertyData(null);
+    summaryAbortRef.current?.abort(); // Drop the previous property's summary stream
+    setIsSummaryStreaming(false);
 
     try {
       // Make the API call to our Next.js API route
@@ -32,6 +86,8 @@ const HomePage = () => {
       if (response.data) {
         setPropertyData(response.data);
         console.log("Data received:", response.data);
+        // Show the rest of the dashboard now; the AI summary streams in separately
+        streamAiSummary(response.data);
       } else {
          // Should ideally not happen if API route handles errors, but good practice
          throw new Error("Received empty data from server.");
@@ -93,7 +149,7 @@ const HomePage = () => {
 
       {/* Dashboard Section - Renders loading skeleton or data */}
       {/* Only render dashboard if data exists and not loading */}
-      {propertyData && !isLoading && <InsightsDashboard data={propertyData} isLoading={isLoading} />}
+      {propertyData && !isLoading && <InsightsDashboard data={propertyData} isLoading={isLoading} isSummaryStreaming={isSummaryStreaming} />}
       {/* Do not render dashboard if loading or if there was an error */}
 
     </div>
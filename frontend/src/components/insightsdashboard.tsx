@@ -27,6 +27,7 @@ const PredictionChart = dynamic(() => import('./PredictionChart'), { // Import P
 interface InsightsDashboardProps {
   data: PropertyData | null;
   isLoading: boolean;
+  isSummaryStreaming?: boolean; // AI summary is still arriving from /api/summary
   className?: string;
 }
 
@@ -38,7 +39,7 @@ const getTrendColor = (trend?: string | null): string => { /* ... */ };
 const CensusDataItem = ({ label, value }: { label: string; value?: number | string | null }) => { /* ... */ };
 
 
-export default function InsightsDashboard({ data, isLoading, className }: InsightsDashboardProps) {
+export default function InsightsDashboard({ data, isLoading, isSummaryStreaming = false, className }: InsightsDashboardProps) {
 
   // --- Loading State ---
   if (isLoading) {
@@ -133,6 +134,8 @@ export default function InsightsDashboard({ data, isLoading, className }: Insigh
                     {data.aiSummary}
                 </ReactMarkdown>
              </div>
+           ) : isSummaryStreaming ? (
+             <div className="space-y-2"><Skeleton className="h-4 w-full bg-gray-300 rounded" /><Skeleton className="h-4 w-5/6 bg-gray-300 rounded" /><Skeleton className="h-4 w-3/4 bg-gray-300 rounded" /></div>
            ) : (
              <p className="text-sm text-gray-500 text-center py-4">
                AI summary could not be generated for this property.